@@ -0,0 +1,225 @@
+import asyncio
+import json
+import struct
+from concurrent.futures import Executor
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from pydantic import ValidationError
+
+from src.constants import MAX_ORDERS, MAX_NDJSON_LINE_BYTES
+from src.models import OptimizationRequest, ErrorResponse
+from src.columnar import ColumnarFormatError, decode_request
+from src.optimizer import LoadOptimizer
+
+
+def _error_record(lineno: int, error: str, message: str, details: Optional[Dict] = None) -> Dict:
+    return {
+        "line": lineno,
+        "error": ErrorResponse(error=error, message=message, details=details or {}).model_dump(mode="json"),
+    }
+
+
+def solve_line(
+    optimizer: LoadOptimizer,
+    lineno: int,
+    line: Optional[bytes],
+    columnar: bool = False
+) -> Dict:
+    """
+    Solve one NDJSON request line, or one columnar frame when columnar is set.
+    Always returns a record tagged with its 1-based input line number, carrying
+    either 'result' or 'error', so one bad line never aborts the stream.
+    """
+    if line is None:
+        return _error_record(
+            lineno, "PAYLOAD_TOO_LARGE", "Request line too large",
+            {"max_size": MAX_NDJSON_LINE_BYTES}
+        )
+
+    try:
+        if columnar:
+            request = decode_request(line, OptimizationRequest)
+        else:
+            request = OptimizationRequest.model_validate_json(line)
+    except ValidationError as e:
+        return _error_record(
+            lineno, "VALIDATION_ERROR", "Invalid input data",
+            {"errors": json.loads(e.json(include_url=False))}
+        )
+    except ColumnarFormatError as e:
+        return _error_record(
+            lineno, "VALIDATION_ERROR", "Invalid input data", {"errors": [{"msg": str(e)}]}
+        )
+
+    if len(request.orders) > MAX_ORDERS:
+        return _error_record(lineno, "PAYLOAD_TOO_LARGE", f"Maximum {MAX_ORDERS} orders allowed")
+
+    try:
+        result = optimizer.optimize(request.truck, request.orders)
+    except Exception as e:
+        return _error_record(lineno, "INTERNAL_SERVER_ERROR", f"Optimization failed: {e}")
+
+    return {"line": lineno, "result": result.model_dump(mode="json")}
+
+
+def encode_record(record: Dict) -> str:
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def _split_lines(buffer: bytearray, lineno: int, oversized: bool):
+    """Pop complete lines off the buffer; shared by the sync and async readers"""
+    lines = []
+    while True:
+        newline = buffer.find(b"\n")
+        if newline < 0:
+            break
+        line = bytes(buffer[:newline]).strip()
+        del buffer[:newline + 1]
+        lineno += 1
+        if oversized or len(line) > MAX_NDJSON_LINE_BYTES:
+            lines.append((lineno, None))
+            oversized = False
+        elif line:
+            lines.append((lineno, line))
+    if len(buffer) > MAX_NDJSON_LINE_BYTES:
+        # Drop the rest of an oversized line instead of buffering it
+        buffer.clear()
+        oversized = True
+    return lines, lineno, oversized
+
+
+async def aiter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into (line number, line) pairs without buffering the
+    whole body. Blank lines are skipped; oversized lines yield None.
+    """
+    buffer = bytearray()
+    lineno = 0
+    oversized = False
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        lines, lineno, oversized = _split_lines(buffer, lineno, oversized)
+        for item in lines:
+            yield item
+
+    tail = bytes(buffer).strip()
+    if oversized or len(tail) > MAX_NDJSON_LINE_BYTES:
+        yield lineno + 1, None
+    elif tail:
+        yield lineno + 1, tail
+
+
+def iter_ndjson_lines(chunks: Iterable[bytes]) -> Iterator[Tuple[int, Optional[bytes]]]:
+    """Synchronous counterpart of aiter_ndjson_lines for files and stdin"""
+    buffer = bytearray()
+    lineno = 0
+    oversized = False
+    for chunk in chunks:
+        buffer.extend(chunk)
+        lines, lineno, oversized = _split_lines(buffer, lineno, oversized)
+        yield from lines
+
+    tail = bytes(buffer).strip()
+    if oversized or len(tail) > MAX_NDJSON_LINE_BYTES:
+        yield lineno + 1, None
+    elif tail:
+        yield lineno + 1, tail
+
+
+_FRAME_LENGTH = struct.Struct("<I")
+
+
+def _split_frames(buffer: bytearray, index: int, skip: int):
+    """Pop complete length-prefixed frames off the buffer"""
+    frames = []
+    if skip:
+        dropped = min(skip, len(buffer))
+        del buffer[:dropped]
+        skip -= dropped
+    while not skip and len(buffer) >= _FRAME_LENGTH.size:
+        (length,) = _FRAME_LENGTH.unpack_from(buffer)
+        if length > MAX_NDJSON_LINE_BYTES:
+            # Discard the oversized frame as it streams past
+            index += 1
+            frames.append((index, None))
+            del buffer[:_FRAME_LENGTH.size]
+            dropped = min(length, len(buffer))
+            del buffer[:dropped]
+            skip = length - dropped
+            continue
+        end = _FRAME_LENGTH.size + length
+        if len(buffer) < end:
+            break
+        index += 1
+        frames.append((index, bytes(buffer[_FRAME_LENGTH.size:end])))
+        del buffer[:end]
+    return frames, index, skip
+
+
+async def aiter_columnar_frames(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a stream of columnar request bodies, each prefixed by its u32
+    little-endian length, into (frame number, frame) pairs.
+    Oversized frames yield None; a truncated final frame is passed on as-is
+    and fails decoding.
+    """
+    buffer = bytearray()
+    index = 0
+    skip = 0
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        frames, index, skip = _split_frames(buffer, index, skip)
+        for item in frames:
+            yield item
+
+    if buffer:
+        yield index + 1, bytes(buffer)
+
+
+async def stream_results(
+    lines: AsyncIterator[Tuple[int, Optional[bytes]]],
+    solve: Callable[[int, Optional[bytes]], Dict],
+    executor: Executor,
+    max_in_flight: int
+) -> AsyncIterator[str]:
+    """
+    Run solves on the given executor and yield NDJSON records as they finish,
+    even while the next input line has not arrived yet.
+    At most max_in_flight solves are pending; input is not read past that
+    point until one completes, which keeps memory flat for any input size.
+    With a thread pool the solves still share the GIL, so the limit bounds
+    memory rather than adding CPU parallelism.
+    """
+    loop = asyncio.get_running_loop()
+    line_iter = lines.__aiter__()
+    pending = set()
+    next_line = None
+    exhausted = False
+
+    try:
+        while True:
+            # Read ahead only while below the in-flight limit
+            if next_line is None and not exhausted and len(pending) < max_in_flight:
+                next_line = asyncio.ensure_future(line_iter.__anext__())
+
+            waiting = pending | ({next_line} if next_line is not None else set())
+            if not waiting:
+                return
+
+            # Wake on whichever comes first, so results never wait for more input
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            for future in done & pending:
+                pending.discard(future)
+                yield encode_record(future.result())
+
+            if next_line is not None and next_line in done:
+                try:
+                    lineno, line = next_line.result()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending.add(loop.run_in_executor(executor, solve, lineno, line))
+                next_line = None
+    finally:
+        if next_line is not None:
+            next_line.cancel()
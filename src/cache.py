@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import List, Optional
+
+from src.models import Order, Truck, OptimizationResult
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached result shape or solver semantics change
+CACHE_SCHEMA_VERSION = 2
+
+
+def canonical_request_key(truck: Truck, orders: List[Order]) -> str:
+    """
+    Stable key for an optimization request.
+    Orders keep their input sequence, since it decides both the order of
+    selected_order_ids and which subset wins a payout tie. The truck id does
+    not affect the solve, so it is left out and patched into cached results.
+    """
+    canonical = json.dumps(
+        {
+            "v": CACHE_SCHEMA_VERSION,
+            "truck": truck.model_dump(mode="json", exclude={"id"}),
+            "orders": [order.model_dump(mode="json") for order in orders],
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SharedResultCache:
+    """
+    Result cache shared by every worker process on the host.
+    Backed by a SQLite file in WAL mode, so readers never block each other or
+    the writer. Reads never write, so eviction is FIFO by insertion: once
+    max_entries is exceeded the oldest inserted rows are dropped, hit or not.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[OptimizationResult]:
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache read failed: {e}")
+            return None
+
+        if row is None:
+            return None
+        try:
+            return OptimizationResult.model_validate_json(row[0])
+        except ValueError:
+            return None
+
+    def put(self, key: str, result: OptimizationResult):
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                    (key, result.model_dump_json()),
+                )
+                # Rowids grow with each insert; keep only the max_entries newest rows
+                conn.execute(
+                    "DELETE FROM results WHERE rowid IN "
+                    "(SELECT rowid FROM results ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache write failed: {e}")
+
+    def clear(self):
+        try:
+            self._connection().execute("DELETE FROM results")
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache clear failed: {e}")
@@ -0,0 +1,71 @@
+from typing import Dict, List
+
+from src.models import Order, Truck
+
+
+# Dimensions every truck and order carries as first-class fields
+BASE_DIMENSIONS = {
+    "weight_lbs": "max_weight_lbs",
+    "volume_cuft": "max_volume_cuft",
+}
+
+
+def truck_capacities(truck: Truck) -> Dict[str, int]:
+    """All named capacity limits of a truck, base dimensions first"""
+    capacities = {name: getattr(truck, field) for name, field in BASE_DIMENSIONS.items()}
+    capacities.update(truck.capacities)
+    return capacities
+
+
+def order_dimension(order: Order, name: str) -> int:
+    """Size of an order along one dimension; dimensions it does not declare are 0"""
+    if name in BASE_DIMENSIONS:
+        return getattr(order, name)
+    return order.dimensions.get(name, 0)
+
+
+class CapacityVector:
+    """
+    Packs every capacity dimension of a truck into one integer, one lane per
+    dimension, so a load is checked against all limits with a single
+    subtract-and-mask instead of a branch per dimension.
+
+    Each lane is one bit wider than the largest capacity. The capacity word
+    holds C + 2^(w-1) per lane (a guard bit above the limit); subtracting a
+    packed load L clears a lane's guard bit exactly when L > C. Loads stay
+    below 2C because items are added one at a time to a load that fit and each
+    item fits on its own, so lanes never borrow from their neighbour.
+    """
+
+    def __init__(self, truck: Truck):
+        capacities = truck_capacities(truck)
+        self.names: List[str] = list(capacities)
+        self.limits: List[int] = list(capacities.values())
+        self.lane_bits = max(limit.bit_length() for limit in self.limits) + 1
+
+        guard = 1 << (self.lane_bits - 1)
+        self.guard_mask = 0
+        self.capacity_word = 0
+        for lane, limit in enumerate(self.limits):
+            shift = lane * self.lane_bits
+            self.guard_mask |= guard << shift
+            self.capacity_word |= (limit + guard) << shift
+
+    def pack(self, order: Order) -> int:
+        """Pack an order's sizes; anything over a limit is clamped to limit + 1"""
+        word = 0
+        for lane, (name, limit) in enumerate(zip(self.names, self.limits)):
+            size = min(order_dimension(order, name), limit + 1)
+            word |= size << (lane * self.lane_bits)
+        return word
+
+    def fits(self, load: int) -> bool:
+        """True when every lane of a packed load is within its capacity"""
+        return (self.capacity_word - load) & self.guard_mask == self.guard_mask
+
+    def unpack(self, load: int) -> Dict[str, int]:
+        lane_mask = (1 << self.lane_bits) - 1
+        return {
+            name: (load >> (lane * self.lane_bits)) & lane_mask
+            for lane, name in enumerate(self.names)
+        }
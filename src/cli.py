@@ -0,0 +1,102 @@
+"""
+Offline bulk optimizer.
+
+Reads OptimizationRequest records from a JSONL file (or stdin) and writes one
+NDJSON result record per input line, in completion order:
+
+    python -m src.cli requests.jsonl -o results.jsonl --workers 4
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Optional
+
+from src.bulk import encode_record, iter_ndjson_lines, solve_line
+from src.optimizer import create_default_optimizer
+
+
+CHUNK_SIZE = 64 * 1024
+
+# Per-process optimizer, created by the pool initializer
+_optimizer = None
+
+
+def _init_worker():
+    global _optimizer
+    _optimizer = create_default_optimizer()
+
+
+def _solve(lineno: int, line: Optional[bytes]) -> Dict:
+    return solve_line(_optimizer, lineno, line)
+
+
+def _read_chunks(stream):
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def run(input_stream, output_stream, workers: int, max_in_flight: int) -> int:
+    """Solve every line of input_stream, returning the number of error records"""
+    lines = iter_ndjson_lines(_read_chunks(input_stream))
+    errors = 0
+
+    def emit(record: Dict):
+        nonlocal errors
+        if "error" in record:
+            errors += 1
+        output_stream.write(encode_record(record))
+
+    if workers <= 1:
+        _init_worker()
+        for lineno, line in lines:
+            emit(_solve(lineno, line))
+        return errors
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = set()
+        for lineno, line in lines:
+            pending.add(pool.submit(_solve, lineno, line))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(future.result())
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                emit(future.result())
+
+    return errors
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Optimize a JSONL file of load requests")
+    parser.add_argument("input", help="JSONL file of OptimizationRequest records, '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON output file, '-' for stdout")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Maximum pending solves (default: 4 per worker)")
+    args = parser.parse_args(argv)
+
+    max_in_flight = args.max_in_flight or 4 * max(1, args.workers)
+
+    input_stream = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        errors = run(input_stream, output_stream, args.workers, max_in_flight)
+    finally:
+        if input_stream is not sys.stdin.buffer:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Columnar binary request format.
+
+Large order pools spend most of their time in JSON decoding and per-Order
+validation. This format ships orders as packed little-endian columns, which
+are read zero-copy through memoryviews, validated column by column, and turned
+into orders without per-field validation.
+
+Layout (all offsets from the start of the body):
+
+    0   magic  b"LOPT"
+    4   u16    format version (1)
+    6   u16    reserved (0)
+    8   u32    header length H
+    12  u32    reserved (0)
+    16  H      JSON header, padded with spaces to a multiple of 8:
+               {"n": N, "ids": [...], "lanes": [[origin, destination], ...],
+                "dimensions": [name, ...], "truck": {...}, ...other fields}
+    ..  i64[N] payout_cents
+        i32[N] weight_lbs, volume_cuft
+        i32[N] pickup_date, delivery_date (days since 1970-01-01)
+        i32[N] lane (index into "lanes")
+        i32[N] one column per name in "dimensions"
+        u8[N]  is_hazmat (0 or 1)
+
+Header fields other than the column metadata are validated with the target
+request model, so the same format serves optimize, plan and bulk requests.
+"""
+import json
+import struct
+import sys
+from array import array
+from datetime import date
+from typing import Dict, List, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from src.models import Order
+
+
+MAGIC = b"LOPT"
+VERSION = 1
+_PREAMBLE = struct.Struct("<4sHHII")
+_COLUMN_META_KEYS = ("n", "ids", "lanes", "dimensions")
+_RESERVED_DIMENSIONS = ("weight_lbs", "volume_cuft")
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MIN_DAY = date.min.toordinal() - _EPOCH_ORDINAL
+_MAX_DAY = date.max.toordinal() - _EPOCH_ORDINAL
+_INT32_MAX = 2 ** 31 - 1
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class ColumnarFormatError(ValueError):
+    """Malformed or invalid columnar request body"""
+
+
+_ORDER_FIELDS = frozenset(Order.model_fields)
+_new_object = object.__new__
+_set_attribute = object.__setattr__
+
+
+def _build_order(fields: Dict) -> Order:
+    """
+    Same result as Order.model_construct for a complete field dict, without
+    its per-field default handling, which dominated decode time.
+    """
+    order = _new_object(Order)
+    _set_attribute(order, "__dict__", fields)
+    _set_attribute(order, "__pydantic_fields_set__", set(_ORDER_FIELDS))
+    _set_attribute(order, "__pydantic_extra__", None)
+    _set_attribute(order, "__pydantic_private__", None)
+    return order
+
+
+def _column(body: memoryview, offset: int, n: int, typecode: str) -> Tuple[memoryview, int]:
+    itemsize = array(typecode).itemsize
+    end = offset + n * itemsize
+    if end > len(body):
+        raise ColumnarFormatError("Body too short for declared columns")
+    if sys.byteorder == "little":
+        column = body[offset:end].cast(typecode)
+    else:
+        swapped = array(typecode, body[offset:end].tobytes())
+        swapped.byteswap()
+        column = memoryview(swapped)
+    return column, end
+
+
+def _check_range(name: str, column: memoryview, low: int, high: int):
+    if len(column) and (min(column) < low or max(column) > high):
+        raise ColumnarFormatError(f"Column '{name}' has values outside [{low}, {high}]")
+
+
+def _decode_header(view: memoryview) -> Tuple[Dict, int]:
+    if len(view) < _PREAMBLE.size:
+        raise ColumnarFormatError("Body too short for columnar preamble")
+    magic, version, _, header_len, _ = _PREAMBLE.unpack_from(view)
+    if magic != MAGIC:
+        raise ColumnarFormatError("Not a columnar request body")
+    if version != VERSION:
+        raise ColumnarFormatError(f"Unsupported columnar format version {version}")
+
+    start = _PREAMBLE.size
+    if header_len % 8 or start + header_len > len(view):
+        raise ColumnarFormatError("Invalid header length")
+    try:
+        header = json.loads(view[start:start + header_len].tobytes())
+    except ValueError as e:
+        raise ColumnarFormatError(f"Invalid header JSON: {e}")
+    if not isinstance(header, dict):
+        raise ColumnarFormatError("Header must be a JSON object")
+    return header, start + header_len
+
+
+def _check_metadata(header: Dict) -> Tuple[int, List[str], List[Tuple[str, str]], List[str]]:
+    n = header.get("n")
+    ids = header.get("ids")
+    lanes = header.get("lanes")
+    dimensions = header.get("dimensions", [])
+
+    if not isinstance(n, int) or isinstance(n, bool) or n < 0:
+        raise ColumnarFormatError("'n' must be a non-negative integer")
+    if not isinstance(ids, list) or len(ids) != n or not all(isinstance(i, str) for i in ids):
+        raise ColumnarFormatError("'ids' must list one string id per order")
+    if not isinstance(lanes, list) or not all(
+        isinstance(lane, list) and len(lane) == 2 and all(isinstance(p, str) for p in lane)
+        for lane in lanes
+    ):
+        raise ColumnarFormatError("'lanes' must be a list of [origin, destination] pairs")
+    if (not isinstance(dimensions, list)
+            or not all(isinstance(d, str) for d in dimensions)
+            or len(set(dimensions)) != len(dimensions)
+            or set(dimensions) & set(_RESERVED_DIMENSIONS)):
+        raise ColumnarFormatError("'dimensions' must be unique names other than weight/volume")
+
+    return n, ids, [tuple(lane) for lane in lanes], dimensions
+
+
+def decode_orders(body: bytes) -> Tuple[Dict, List[Order]]:
+    """
+    Decode a columnar body into its header fields and orders.
+    Columns are validated as a whole, so orders are built without
+    per-field validation.
+    """
+    view = memoryview(body)
+    header, offset = _decode_header(view)
+    n, ids, lanes, dimensions = _check_metadata(header)
+
+    payout, offset = _column(view, offset, n, "q")
+    int_columns = {}
+    for name in ("weight_lbs", "volume_cuft", "pickup_date", "delivery_date", "lane", *dimensions):
+        int_columns[name], offset = _column(view, offset, n, "i")
+    hazmat, offset = _column(view, offset, n, "B")
+    if offset != len(view):
+        raise ColumnarFormatError("Body length does not match declared columns")
+
+    _check_range("payout_cents", payout, 0, 2 ** 63 - 1)
+    _check_range("weight_lbs", int_columns["weight_lbs"], 1, _INT32_MAX)
+    _check_range("volume_cuft", int_columns["volume_cuft"], 1, _INT32_MAX)
+    _check_range("pickup_date", int_columns["pickup_date"], _MIN_DAY, _MAX_DAY)
+    _check_range("delivery_date", int_columns["delivery_date"], _MIN_DAY, _MAX_DAY)
+    _check_range("lane", int_columns["lane"], 0, len(lanes) - 1)
+    _check_range("is_hazmat", hazmat, 0, 1)
+    for name in dimensions:
+        _check_range(name, int_columns[name], 0, _INT32_MAX)
+
+    # Repeated days and lanes are common; decode each once
+    days: Dict[int, date] = {}
+
+    def to_date(day: int) -> date:
+        if day not in days:
+            days[day] = date.fromordinal(_EPOCH_ORDINAL + day)
+        return days[day]
+
+    lane_names = [(origin, destination) for origin, destination in lanes]
+    dimension_columns = [(name, int_columns[name]) for name in dimensions]
+
+    orders = []
+    for i, (payout_cents, weight, volume, pickup, delivery, lane, is_hazmat) in enumerate(zip(
+        payout, int_columns["weight_lbs"], int_columns["volume_cuft"],
+        int_columns["pickup_date"], int_columns["delivery_date"], int_columns["lane"], hazmat
+    )):
+        origin, destination = lane_names[lane]
+        orders.append(_build_order({
+            "id": ids[i],
+            "payout_cents": payout_cents,
+            "weight_lbs": weight,
+            "volume_cuft": volume,
+            "origin": origin,
+            "destination": destination,
+            "pickup_date": to_date(pickup),
+            "delivery_date": to_date(delivery),
+            "is_hazmat": bool(is_hazmat),
+            "dimensions": {name: column[i] for name, column in dimension_columns},
+        }))
+
+    fields = {k: v for k, v in header.items() if k not in _COLUMN_META_KEYS}
+    return fields, orders
+
+
+def decode_request(body: bytes, model: Type[M]) -> M:
+    """
+    Decode a columnar body into a request model.
+    Non-order fields go through normal model validation and may raise
+    pydantic.ValidationError; column problems raise ColumnarFormatError.
+    """
+    fields, orders = decode_orders(body)
+    request = model.model_validate({**fields, "orders": []})
+    return request.model_copy(update={"orders": orders})
+
+
+def encode_request(request: BaseModel) -> bytes:
+    """Encode a request model with an 'orders' field into the columnar format"""
+    orders: List[Order] = request.orders
+    lanes: Dict[Tuple[str, str], int] = {}
+    dimensions: List[str] = []
+    for order in orders:
+        lanes.setdefault((order.origin, order.destination), len(lanes))
+        for name in order.dimensions:
+            if name not in dimensions:
+                dimensions.append(name)
+
+    header = request.model_dump(mode="json", exclude={"orders"})
+    header.update({
+        "n": len(orders),
+        "ids": [order.id for order in orders],
+        "lanes": [list(lane) for lane in lanes],
+        "dimensions": dimensions,
+    })
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    header_bytes += b" " * (-len(header_bytes) % 8)
+
+    columns = [array("q", [order.payout_cents for order in orders])]
+    columns += [
+        array("i", values) for values in (
+            [order.weight_lbs for order in orders],
+            [order.volume_cuft for order in orders],
+            [order.pickup_date.toordinal() - _EPOCH_ORDINAL for order in orders],
+            [order.delivery_date.toordinal() - _EPOCH_ORDINAL for order in orders],
+            [lanes[(order.origin, order.destination)] for order in orders],
+            *([order.dimensions.get(name, 0) for order in orders] for name in dimensions),
+        )
+    ]
+    columns.append(array("B", [int(order.is_hazmat) for order in orders]))
+    if sys.byteorder != "little":
+        for column in columns:
+            column.byteswap()
+
+    return b"".join([
+        _PREAMBLE.pack(MAGIC, VERSION, 0, len(header_bytes), 0),
+        header_bytes,
+        *(column.tobytes() for column in columns),
+    ])
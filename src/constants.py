@@ -1,4 +1,5 @@
 from enum import Enum
+import os
 
 class ErrorMessages(str, Enum):
     INVALID_INPUT = "Invalid input data"
@@ -10,4 +11,31 @@ class ErrorMessages(str, Enum):
 
 MAX_ORDERS = 25  # Conservative limit for DP
 MAX_TIME_WINDOW_GAP_DAYS = 30
-CACHE_SIZE = 1000
\ No newline at end of file
+CACHE_SIZE = 1000
+
+# Profiling (opt-in, per request)
+PROFILING_ENABLED = os.getenv("LOAD_OPTIMIZER_PROFILING", "").lower() in ("1", "true", "yes")
+PROFILE_DIR = os.getenv("LOAD_OPTIMIZER_PROFILE_DIR", "/tmp/load-optimizer-profiles")
+PROFILE_RING_SIZE = int(os.getenv("LOAD_OPTIMIZER_PROFILE_RING_SIZE", "50"))
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+# When set, /debug/profiles requires a matching X-Debug-Token header
+PROFILE_DEBUG_TOKEN = os.getenv("LOAD_OPTIMIZER_PROFILE_TOKEN", "")
+
+# Result cache shared across worker processes, opt-in (empty path disables it).
+# Use a per-deployment path: entries outlive restarts and are only invalidated
+# by CACHE_SCHEMA_VERSION in src/cache.py.
+RESULT_CACHE_PATH = os.getenv("LOAD_OPTIMIZER_CACHE_PATH", "")
+
+# Bulk NDJSON optimization
+MAX_NDJSON_LINE_BYTES = 1024 * 1024  # Same 1MB limit as a single optimize call
+BULK_MAX_IN_FLIGHT = int(os.getenv("LOAD_OPTIMIZER_BULK_MAX_IN_FLIGHT", "8"))
+
+# Multi-day load chaining
+MAX_PLAN_ORDERS = 500
+# Each lane-day group is one exhaustive knapsack solve; 12 orders keep a
+# full 500-order plan around a second, where 25 would take minutes
+MAX_PLAN_ORDERS_PER_LANE_DAY = 12
+
+# Columnar binary request format (see src/columnar.py); JSON stays the default
+COLUMNAR_CONTENT_TYPE = "application/vnd.load-optimizer.columnar"
@@ -1,14 +1,30 @@
-from fastapi import FastAPI, HTTPException, status, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, status, Request, Response, Depends, Header
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.exceptions import RequestValidationError
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from starlette.datastructures import Headers
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import time
+import hmac
 import logging
-from typing import Dict, Any
+from functools import partial
+from typing import Dict, Any, Optional
 
 # Import local modules - using absolute imports
-from src.models import OptimizationRequest, OptimizationResult, ErrorResponse
-from src.optimizer import LoadOptimizer
+from src.models import (
+    OptimizationRequest, OptimizationResult, ChainPlanRequest, ChainPlanResult, ErrorResponse
+)
+from src.optimizer import create_default_optimizer
+from src.bulk import aiter_columnar_frames, aiter_ndjson_lines, solve_line, stream_results
+from src.columnar import ColumnarFormatError, decode_request
+from src.planner import plan_load_chain
+from src.constants import (
+    BULK_MAX_IN_FLIGHT, COLUMNAR_CONTENT_TYPE, MAX_PLAN_ORDERS, PROFILING_ENABLED, PROFILE_DIR, PROFILE_RING_SIZE, PROFILE_DEBUG_TOKEN
+)
+from src.profiling import FoldedProfiler, ProfileStore, is_profile_requested
 
 
 # Configure logging
@@ -18,8 +34,17 @@ logger = logging.getLogger(__name__)
 # Constants
 MAX_ORDERS = 25
 
+# Endpoints that read the whole body at once; bulk streams and limits per line
+SIZE_LIMITED_PATHS = ("/api/v1/load-optimizer/optimize", "/api/v1/load-optimizer/plan")
+
 # Global optimizer instance
-optimizer = LoadOptimizer()
+optimizer = create_default_optimizer()
+
+# Dedicated pool for bulk solves, kept off the event loop's default executor
+bulk_executor = ThreadPoolExecutor(max_workers=BULK_MAX_IN_FLIGHT, thread_name_prefix="bulk-solve")
+
+# Profile ring, only touched when profiling is enabled
+profile_store = ProfileStore(PROFILE_DIR, PROFILE_RING_SIZE)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -28,6 +53,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down Load Optimizer Service")
+    bulk_executor.shutdown(wait=False, cancel_futures=True)
 
 app = FastAPI(
     title="SmartLoad Optimization API",
@@ -45,7 +71,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content=ErrorResponse(
             error="VALIDATION_ERROR",
             message="Invalid input data",
-            details={"errors": exc.errors()}
+            details={"errors": jsonable_encoder(exc.errors())}
         ).dict()
     )
 
@@ -84,10 +110,63 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "POST /api/v1/load-optimizer/optimize": "Optimize truck load",
+            "POST /api/v1/load-optimizer/optimize/bulk": "Optimize NDJSON stream of requests",
+            "POST /api/v1/load-optimizer/plan": "Plan a multi-day chain of loads for one truck",
             "GET /health": "Health check"
         }
     }
 
+# Request bodies: JSON by default, columnar binary when selected by Content-Type
+def _is_columnar(http_request: Request) -> bool:
+    content_type = http_request.headers.get("content-type", "")
+    return content_type.split(";")[0].strip().lower() == COLUMNAR_CONTENT_TYPE
+
+async def _parse_body(http_request: Request, model):
+    body = await http_request.body()
+    try:
+        if _is_columnar(http_request):
+            return decode_request(body, model)
+        return model.model_validate_json(body)
+    except ColumnarFormatError as e:
+        raise RequestValidationError([
+            {"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}
+        ])
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)
+        ])
+
+async def optimization_request_body(http_request: Request) -> OptimizationRequest:
+    return await _parse_body(http_request, OptimizationRequest)
+
+async def chain_plan_request_body(http_request: Request) -> ChainPlanRequest:
+    return await _parse_body(http_request, ChainPlanRequest)
+
+def _request_body_docs(model) -> Dict[str, Any]:
+    # The body is parsed by a dependency, so describe it here; nested models
+    # are inlined because '#/$defs' refs would not resolve inside the document
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+    
+    def inline(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return inline(defs[node["$ref"].split("/")[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+    
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": inline(schema)},
+                COLUMNAR_CONTENT_TYPE: {"schema": {"type": "string", "format": "binary"}}
+            }
+        }
+    }
+
 # Main optimization endpoint
 @app.post(
     "/api/v1/load-optimizer/optimize",
@@ -98,9 +177,14 @@ async def root():
         413: {"description": "Too many orders"},
         422: {"description": "Unprocessable entity"}
     },
+    openapi_extra=_request_body_docs(OptimizationRequest),
     tags=["Optimization"]
 )
-async def optimize_load(request: OptimizationRequest) -> OptimizationResult:
+async def optimize_load(
+    http_request: Request,
+    response: Response,
+    request: OptimizationRequest = Depends(optimization_request_body)
+) -> OptimizationResult:
     """
     Optimize truck load by selecting the best combination of orders.
     
@@ -108,6 +192,10 @@ async def optimize_load(request: OptimizationRequest) -> OptimizationResult:
     - **Constraints**: Weight, volume, hazmat compatibility, route compatibility
     - **Input**: Up to 25 orders
     - **Returns**: Optimal order combination with utilization metrics
+    - **Formats**: JSON, or columnar binary with
+      `Content-Type: application/vnd.load-optimizer.columnar`
+    - **Profiling**: When enabled, send `X-Profile: 1` (or `?profile=1`) to capture
+      the solve; the profile id is returned in the `X-Profile-Id` header
     """
     start_time = time.time()
     
@@ -122,7 +210,25 @@ async def optimize_load(request: OptimizationRequest) -> OptimizationResult:
     
     try:
         # Run optimization
-        result = optimizer.optimize_bruteforce(request.truck, request.orders)
+        if PROFILING_ENABLED and is_profile_requested(http_request.headers, http_request.query_params):
+            # Profile the solve itself, not a result cache lookup
+            with FoldedProfiler() as profiler:
+                result = optimizer.optimize_bruteforce(request.truck, request.orders)
+            
+            elapsed_ms = (time.time() - start_time) * 1000
+            try:
+                profile_id = profile_store.save(
+                    await http_request.body(), profiler.folded(), elapsed_ms, request.truck.id,
+                    http_request.headers.get("content-type", "application/json")
+                )
+            except OSError as e:
+                # A failed capture must not fail a solve that succeeded
+                logger.warning(f"Could not store profile for truck {request.truck.id}: {e}")
+            else:
+                response.headers["X-Profile-Id"] = profile_id
+                logger.info(f"Captured profile {profile_id} for truck {request.truck.id}")
+        else:
+            result = optimizer.optimize(request.truck, request.orders)
         
         # Log performance
         elapsed_ms = (time.time() - start_time) * 1000
@@ -139,30 +245,173 @@ async def optimize_load(request: OptimizationRequest) -> OptimizationResult:
             detail=f"Optimization failed: {str(e)}"
         )
 
-# Middleware for logging and request validation
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
+# Multi-day load chaining endpoint
+@app.post(
+    "/api/v1/load-optimizer/plan",
+    response_model=ChainPlanResult,
+    responses={
+        200: {"description": "Planning successful"},
+        400: {"description": "Invalid input"},
+        413: {"description": "Too many orders"}
+    },
+    openapi_extra=_request_body_docs(ChainPlanRequest),
+    tags=["Optimization"]
+)
+async def plan_chain(
+    request: ChainPlanRequest = Depends(chain_plan_request_body)
+) -> ChainPlanResult:
+    """
+    Plan a sequence of loads for one truck over several days.
+    
+    - **Maximizes**: Total payout across all chained loads
+    - **Chaining**: Each load starts where the previous one was delivered,
+      from the day after delivery, using `pickup_date`/`delivery_date`
+    - **Input**: Up to 500 orders, at most 12 per lane and pickup day
+    - **Formats**: JSON, or columnar binary with
+      `Content-Type: application/vnd.load-optimizer.columnar`
+    """
     start_time = time.time()
     
-    # Check content length for large payloads
-    if request.method == "POST" and request.url.path == "/api/v1/load-optimizer/optimize":
-        content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > 1024 * 1024:  # 1MB limit
-            return JSONResponse(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                content=ErrorResponse(
-                    error="PAYLOAD_TOO_LARGE",
-                    message="Request payload too large",
-                    details={"max_size": "1MB"}
-                ).dict()
-            )
+    if len(request.orders) > MAX_PLAN_ORDERS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Maximum {MAX_PLAN_ORDERS} orders allowed"
+        )
+    
+    logger.info(f"Planning load chain for truck {request.truck.id} with {len(request.orders)} orders")
     
-    response = await call_next(request)
+    try:
+        # Runs for up to about a second; keep it off the event loop
+        plan = await asyncio.get_running_loop().run_in_executor(None, partial(
+            plan_load_chain, optimizer, request.truck, request.orders,
+            request.start_location, request.start_date, request.end_date
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    
+    elapsed_ms = (time.time() - start_time) * 1000
+    logger.info(f"Planning completed in {elapsed_ms:.2f}ms. "
+               f"Chained {len(plan.loads)} loads, "
+               f"Revenue: ${plan.total_payout_cents/100:.2f}")
+    
+    return plan
+
+# Bulk streaming endpoint
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming response that may keep reading the request body while sending.
+    StreamingResponse listens for disconnects on `receive` concurrently, which
+    would swallow body chunks; here a disconnect surfaces from request.stream().
+    """
+    media_type = "application/x-ndjson"
+    
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+@app.post(
+    "/api/v1/load-optimizer/optimize/bulk",
+    response_class=NDJSONStreamingResponse,
+    responses={
+        200: {
+            "description": "NDJSON stream of results in completion order",
+            "content": {"application/x-ndjson": {}}
+        }
+    },
+    tags=["Optimization"]
+)
+async def optimize_bulk(http_request: Request):
+    """
+    Optimize a stream of requests.
     
-    process_time = (time.time() - start_time) * 1000
-    logger.info(f"{request.method} {request.url.path} completed in {process_time:.2f}ms")
+    - **Input**: NDJSON body, one `OptimizationRequest` per line; or with
+      `Content-Type: application/vnd.load-optimizer.columnar`, a sequence of
+      columnar bodies each prefixed by its u32 little-endian length
+    - **Returns**: NDJSON stream, one record per input line as each solve finishes,
+      `{"line": n, "result": {...}}` or `{"line": n, "error": {...}}`
+    - **Backpressure**: at most `LOAD_OPTIMIZER_BULK_MAX_IN_FLIGHT` solves are pending;
+      this bounds memory, while CPU parallelism comes from running several uvicorn workers
+    """
+    logger.info("Processing bulk optimization stream")
+    if _is_columnar(http_request):
+        lines = aiter_columnar_frames(http_request.stream())
+        solve = partial(solve_line, optimizer, columnar=True)
+    else:
+        lines = aiter_ndjson_lines(http_request.stream())
+        solve = partial(solve_line, optimizer)
+    return NDJSONStreamingResponse(
+        stream_results(lines, solve, bulk_executor, BULK_MAX_IN_FLIGHT)
+    )
+
+# Debug endpoints for captured profiles
+def _require_profiling(x_debug_token: Optional[str] = Header(default=None)):
+    """Profiles hold raw customer payloads; gate them behind the flag and debug token"""
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+    if PROFILE_DEBUG_TOKEN and not hmac.compare_digest(x_debug_token or "", PROFILE_DEBUG_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid debug token")
+
+@app.get("/debug/profiles", tags=["Debug"], dependencies=[Depends(_require_profiling)])
+async def list_profiles():
+    return {"profiles": profile_store.list_profiles()}
+
+@app.get("/debug/profiles/{profile_id}", tags=["Debug"], dependencies=[Depends(_require_profiling)], response_class=PlainTextResponse)
+async def get_profile(profile_id: str):
+    """Return the profile in collapsed stack format (flamegraph.pl, speedscope, inferno)"""
+    folded = profile_store.get_folded(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(folded)
+
+@app.get("/debug/profiles/{profile_id}/request", tags=["Debug"], dependencies=[Depends(_require_profiling)])
+async def get_profile_request(profile_id: str):
+    """Return the exact request payload that was profiled, with its original content type"""
+    meta = profile_store.get_meta(profile_id)
+    payload = profile_store.get_payload(profile_id)
+    if meta is None or payload is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return Response(content=payload, media_type=meta.get("content_type", "application/json"))
+
+# Middleware for logging and request validation
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI middleware: unlike @app.middleware("http") it does not wrap
+    `receive`, so streaming endpoints can keep reading the body after the
+    handler has returned its response.
+    """
+    def __init__(self, app):
+        self.app = app
     
-    return response
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.time()
+        method, path = scope["method"], scope["path"]
+        
+        # Check content length for large payloads
+        if method == "POST" and path in SIZE_LIMITED_PATHS:
+            content_length = Headers(scope=scope).get("content-length")
+            if content_length and int(content_length) > 1024 * 1024:  # 1MB limit
+                response = JSONResponse(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    content=ErrorResponse(
+                        error="PAYLOAD_TOO_LARGE",
+                        message="Request payload too large",
+                        details={"max_size": "1MB"}
+                    ).dict()
+                )
+                await response(scope, receive, send)
+                return
+        
+        await self.app(scope, receive, send)
+        
+        process_time = (time.time() - start_time) * 1000
+        logger.info(f"{method} {path} completed in {process_time:.2f}ms")
+
+app.add_middleware(RequestLoggingMiddleware)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict
+from pydantic import BaseModel, Field, conint, field_validator
+from typing import List, Dict, Optional
 from datetime import date
 
 
@@ -12,6 +12,17 @@ class Truck(BaseModel):
     max_weight_lbs: int = Field(..., gt=0)
     max_volume_cuft: int = Field(..., gt=0)
 
+    # Additional named limits, e.g. {"pallet_positions": 26, "linear_feet": 53}
+    capacities: Dict[str, conint(gt=0)] = Field(default_factory=dict)
+
+    @field_validator("capacities")
+    @classmethod
+    def check_capacity_names(cls, capacities):
+        reserved = {"weight_lbs", "volume_cuft"} & set(capacities)
+        if reserved:
+            raise ValueError(f"Use max_weight_lbs/max_volume_cuft instead of {sorted(reserved)}")
+        return capacities
+
 
 class Order(BaseModel):
     id: str
@@ -27,6 +38,9 @@ class Order(BaseModel):
 
     is_hazmat: bool
 
+    # Sizes along the truck's additional dimensions; missing ones count as 0
+    dimensions: Dict[str, conint(ge=0)] = Field(default_factory=dict)
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -63,6 +77,35 @@ class OptimizationResult(BaseModel):
     utilization_weight_percent: float
     utilization_volume_percent: float
 
+    # Totals and utilization for the truck's additional dimensions
+    dimension_totals: Dict[str, int] = Field(default_factory=dict)
+    dimension_utilization_percent: Dict[str, float] = Field(default_factory=dict)
+
+
+class ChainPlanRequest(BaseModel):
+    truck: Truck
+    orders: List[Order]
+
+    # Where and when the truck becomes available
+    start_location: str
+    start_date: date
+    # Last day a load may be delivered; defaults to no limit
+    end_date: Optional[date] = None
+
+
+class PlannedLoad(BaseModel):
+    origin: str
+    destination: str
+    pickup_date: date
+    delivery_date: date
+    load: OptimizationResult
+
+
+class ChainPlanResult(BaseModel):
+    truck_id: str
+    loads: List[PlannedLoad]
+    total_payout_cents: int
+
 
 class ErrorResponse(BaseModel):
     error: str
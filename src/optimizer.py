@@ -1,13 +1,35 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from src.models import Order, Truck, OptimizationResult
+from src.cache import SharedResultCache, canonical_request_key
+from src.capacity import CapacityVector
+from src.constants import CACHE_SIZE, RESULT_CACHE_PATH
 
 
 
 class LoadOptimizer:
-    def __init__(self):
+    def __init__(self, cache: Optional[SharedResultCache] = None):
+        self.cache = cache
         self.cache_hits = 0
         self.cache_misses = 0
     
+    def optimize(self, truck: Truck, orders: List[Order]) -> OptimizationResult:
+        """
+        Optimize a load, serving repeats from the shared result cache when configured
+        """
+        if self.cache is None:
+            return self.optimize_bruteforce(truck, orders)
+        
+        key = canonical_request_key(truck, orders)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached.model_copy(update={"truck_id": truck.id})
+        
+        self.cache_misses += 1
+        result = self.optimize_bruteforce(truck, orders)
+        self.cache.put(key, result)
+        return result
+    
     def validate_orders_compatibility(self, orders: List[Order]) -> Tuple[bool, str]:
         """
         Validate if all orders are compatible:
@@ -38,31 +60,35 @@ class LoadOptimizer:
         """
         n = len(orders)
         if n == 0:
-            return self._create_empty_result(truck.id)
+            return self._create_empty_result(truck)
+        
+        # Every capacity dimension packed into one integer per order
+        capacity = CapacityVector(truck)
         
         # Pre-filter orders that exceed capacity individually
-        feasible_orders = [
-            order for order in orders 
-            if (order.weight_lbs <= truck.max_weight_lbs and 
-                order.volume_cuft <= truck.max_volume_cuft)
-        ]
+        feasible_orders = []
+        feasible_sizes = []
+        for order in orders:
+            size = capacity.pack(order)
+            if capacity.fits(size):
+                feasible_orders.append(order)
+                feasible_sizes.append(size)
         
         if not feasible_orders:
-            return self._create_empty_result(truck.id)
+            return self._create_empty_result(truck)
         
         n = len(feasible_orders)
         best_mask = 0
         best_revenue = 0
-        best_weight = 0
-        best_volume = 0
+        capacity_word = capacity.capacity_word
+        guard_mask = capacity.guard_mask
         
         # Try all combinations using bitmask
         total_masks = 1 << n
         
         for mask in range(1, total_masks):
             current_orders = []
-            current_weight = 0
-            current_volume = 0
+            current_load = 0
             current_revenue = 0
             
             # Check if we should prune early
@@ -70,15 +96,14 @@ class LoadOptimizer:
             for i in range(n):
                 if mask & (1 << i):
                     order = feasible_orders[i]
-                    # Quick capacity check
-                    if (current_weight + order.weight_lbs > truck.max_weight_lbs or
-                        current_volume + order.volume_cuft > truck.max_volume_cuft):
+                    # Quick capacity check across all dimensions at once
+                    # (CapacityVector.fits, inlined for the hot loop)
+                    current_load += feasible_sizes[i]
+                    if (capacity_word - current_load) & guard_mask != guard_mask:
                         prune = True
                         break
                     
                     current_orders.append(order)
-                    current_weight += order.weight_lbs
-                    current_volume += order.volume_cuft
                     current_revenue += order.payout_cents
             
             if prune:
@@ -93,8 +118,6 @@ class LoadOptimizer:
             if current_revenue > best_revenue:
                 best_mask = mask
                 best_revenue = current_revenue
-                best_weight = current_weight
-                best_volume = current_volume
         
         # Build result from best mask
         selected_orders = []
@@ -107,7 +130,7 @@ class LoadOptimizer:
     def _create_result(self, truck: Truck, orders: List[Order]) -> OptimizationResult:
         """Create optimization result from selected orders"""
         if not orders:
-            return self._create_empty_result(truck.id)
+            return self._create_empty_result(truck)
         
         total_payout = sum(order.payout_cents for order in orders)
         total_weight = sum(order.weight_lbs for order in orders)
@@ -116,6 +139,15 @@ class LoadOptimizer:
         weight_util = (total_weight / truck.max_weight_lbs * 100) if truck.max_weight_lbs > 0 else 0
         volume_util = (total_volume / truck.max_volume_cuft * 100) if truck.max_volume_cuft > 0 else 0
         
+        dimension_totals = {
+            name: sum(order.dimensions.get(name, 0) for order in orders)
+            for name in truck.capacities
+        }
+        dimension_util = {
+            name: round(total / truck.capacities[name] * 100, 2)
+            for name, total in dimension_totals.items()
+        }
+        
         return OptimizationResult(
             truck_id=truck.id,
             selected_order_ids=[order.id for order in orders],
@@ -123,17 +155,27 @@ class LoadOptimizer:
             total_weight_lbs=total_weight,
             total_volume_cuft=total_volume,
             utilization_weight_percent=round(weight_util, 2),
-            utilization_volume_percent=round(volume_util, 2)
+            utilization_volume_percent=round(volume_util, 2),
+            dimension_totals=dimension_totals,
+            dimension_utilization_percent=dimension_util
         )
     
-    def _create_empty_result(self, truck_id: str) -> OptimizationResult:
+    def _create_empty_result(self, truck: Truck) -> OptimizationResult:
         """Create empty result when no feasible solution"""
         return OptimizationResult(
-            truck_id=truck_id,
+            truck_id=truck.id,
             selected_order_ids=[],
             total_payout_cents=0,
             total_weight_lbs=0,
             total_volume_cuft=0,
             utilization_weight_percent=0.0,
-            utilization_volume_percent=0.0
-        )
\ No newline at end of file
+            utilization_volume_percent=0.0,
+            dimension_totals={name: 0 for name in truck.capacities},
+            dimension_utilization_percent={name: 0.0 for name in truck.capacities}
+        )
+
+
+def create_default_optimizer() -> LoadOptimizer:
+    """Optimizer wired to the configured shared result cache, one per process"""
+    cache = SharedResultCache(RESULT_CACHE_PATH, CACHE_SIZE) if RESULT_CACHE_PATH else None
+    return LoadOptimizer(cache=cache)
@@ -0,0 +1,114 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from src.constants import MAX_PLAN_ORDERS_PER_LANE_DAY
+from src.models import Order, Truck, OptimizationResult, ChainPlanResult, PlannedLoad
+from src.optimizer import LoadOptimizer
+
+
+# (origin, destination, pickup_date): orders that can travel as one load
+LaneDay = Tuple[str, str, date]
+
+
+def plan_load_chain(
+    optimizer: LoadOptimizer,
+    truck: Truck,
+    orders: List[Order],
+    start_location: str,
+    start_date: date,
+    end_date: Optional[date] = None
+) -> ChainPlanResult:
+    """
+    Pick the sequence of loads for one truck that maximizes total payout.
+
+    Orders are grouped by lane and pickup day; each group's best single load
+    comes from the per-lane knapsack solver and is computed once, however many
+    states reach it. A dynamic program over (location, day) then chooses, at
+    each state, between waiting for the next pickup day and hauling a load.
+    After a delivery the truck is free at the destination the following day.
+    Orders delivered before their pickup date can never be hauled and are
+    ignored.
+    """
+    groups: Dict[LaneDay, List[Order]] = defaultdict(list)
+    for order in orders:
+        if order.pickup_date < start_date or order.delivery_date < order.pickup_date:
+            continue
+        if end_date is not None and order.delivery_date > end_date:
+            continue
+        groups[(order.origin, order.destination, order.pickup_date)].append(order)
+
+    for (origin, destination, pickup), group in groups.items():
+        if len(group) > MAX_PLAN_ORDERS_PER_LANE_DAY:
+            raise ValueError(
+                f"{len(group)} orders on {origin} -> {destination} for {pickup} "
+                f"(max {MAX_PLAN_ORDERS_PER_LANE_DAY} per lane and day)"
+            )
+
+    days = sorted({pickup for _, _, pickup in groups})
+    departures: Dict[Tuple[str, date], List[LaneDay]] = defaultdict(list)
+    for lane_day in groups:
+        departures[(lane_day[0], lane_day[2])].append(lane_day)
+
+    # Best single load per lane-day, shared by every state that reaches it
+    best_loads: Dict[LaneDay, Tuple[OptimizationResult, date]] = {}
+
+    def best_load(lane_day: LaneDay) -> Tuple[OptimizationResult, date]:
+        if lane_day not in best_loads:
+            group = groups[lane_day]
+            result = optimizer.optimize(truck, group)
+            selected = set(result.selected_order_ids)
+            delivery = max(
+                (order.delivery_date for order in group if order.id in selected),
+                default=lane_day[2]
+            )
+            best_loads[lane_day] = (result, delivery)
+        return best_loads[lane_day]
+
+    # value[(location, i)]: best payout from `location` when free on days[i]
+    locations = {start_location} | {origin for origin, _ in departures}
+    value: Dict[Tuple[str, int], int] = {}
+    choice: Dict[Tuple[str, int], Optional[LaneDay]] = {}
+
+    for i in range(len(days) - 1, -1, -1):
+        for location in locations:
+            best = value.get((location, i + 1), 0)
+            best_choice = None
+            for lane_day in departures.get((location, days[i]), []):
+                result, delivery = best_load(lane_day)
+                if not result.selected_order_ids:
+                    continue
+                next_i = bisect_left(days, delivery + timedelta(days=1))
+                # Delivery is never before pickup, so the walk always moves forward
+                assert next_i > i
+                total = result.total_payout_cents + value.get((lane_day[1], next_i), 0)
+                if total > best:
+                    best = total
+                    best_choice = lane_day
+            value[(location, i)] = best
+            choice[(location, i)] = best_choice
+
+    # Walk the chosen transitions from the starting state
+    loads = []
+    location, i = start_location, bisect_left(days, start_date)
+    while i < len(days):
+        lane_day = choice.get((location, i))
+        if lane_day is None:
+            i += 1
+            continue
+        result, delivery = best_load(lane_day)
+        loads.append(PlannedLoad(
+            origin=lane_day[0],
+            destination=lane_day[1],
+            pickup_date=lane_day[2],
+            delivery_date=delivery,
+            load=result
+        ))
+        location, i = lane_day[1], bisect_left(days, delivery + timedelta(days=1))
+
+    return ChainPlanResult(
+        truck_id=truck.id,
+        loads=loads,
+        total_payout_cents=sum(planned.load.total_payout_cents for planned in loads)
+    )
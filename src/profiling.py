@@ -0,0 +1,178 @@
+import json
+import os
+import re
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from src.constants import PROFILE_HEADER, PROFILE_QUERY_PARAM
+
+
+_TRUTHY = ("1", "true", "yes")
+_PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def is_profile_requested(headers, query_params) -> bool:
+    """Check whether the caller asked for this request to be profiled"""
+    value = headers.get(PROFILE_HEADER) or query_params.get(PROFILE_QUERY_PARAM) or ""
+    return value.lower() in _TRUTHY
+
+
+class FoldedProfiler:
+    """
+    Deterministic profiler for the current thread.
+    Accumulates time spent in each call stack and renders it in the
+    collapsed ("folded") format read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self):
+        self._stack: List[str] = []
+        self._times: Dict[Tuple[str, ...], int] = defaultdict(int)
+        self._last = 0
+
+    def __enter__(self) -> "FoldedProfiler":
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self._callback)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        sys.setprofile(None)
+        return False
+
+    def _callback(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        if self._stack:
+            self._times[tuple(self._stack)] += now - self._last
+
+        if event == "call":
+            code = frame.f_code
+            self._stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+        elif event == "c_call":
+            self._stack.append(f"builtins:{getattr(arg, '__qualname__', repr(arg))}")
+        elif event in ("return", "c_return", "c_exception"):
+            if self._stack:
+                self._stack.pop()
+
+        self._last = time.perf_counter_ns()
+
+    def folded(self) -> str:
+        """Render stacks as 'frame;frame;frame <microseconds>' lines"""
+        lines = []
+        for stack, elapsed_ns in sorted(self._times.items()):
+            elapsed_us = elapsed_ns // 1000
+            if elapsed_us > 0:
+                lines.append(f"{';'.join(stack)} {elapsed_us}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+class ProfileStore:
+    """
+    Bounded on-disk ring of captured profiles.
+    Each entry is a small '<id>.json' metadata file, the raw request body in
+    '<id>.body' and the stacks in '<id>.folded'. Eviction orders entries by
+    metadata file mtime, so it never reads the stored payloads.
+    """
+
+    _EXTENSIONS = ("json", "folded", "body")
+
+    def __init__(self, directory: str, capacity: int):
+        self.directory = directory
+        self.capacity = max(1, capacity)
+
+    def save(
+        self,
+        payload: bytes,
+        folded: str,
+        elapsed_ms: float,
+        truck_id: str,
+        content_type: str = "application/json"
+    ) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = uuid.uuid4().hex
+        meta = {
+            "id": profile_id,
+            "created_at": time.time(),
+            "truck_id": truck_id,
+            "elapsed_ms": round(elapsed_ms, 3),
+            "payload_bytes": len(payload),
+            "content_type": content_type,
+        }
+        # Metadata last so a listed entry always has its body and profile
+        self._write_atomic(f"{profile_id}.body", payload)
+        self._write_atomic(f"{profile_id}.folded", folded.encode("utf-8"))
+        self._write_atomic(f"{profile_id}.json", json.dumps(meta).encode("utf-8"))
+        self._evict()
+        return profile_id
+
+    def list_profiles(self) -> List[Dict]:
+        entries = []
+        for profile_id, _ in self._entries():
+            meta = self.get_meta(profile_id)
+            if meta is not None:
+                entries.append(meta)
+        entries.sort(key=lambda m: m["created_at"], reverse=True)
+        return entries
+
+    def get_meta(self, profile_id: str) -> Optional[Dict]:
+        content = self._read(profile_id, "json")
+        if content is None:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError:
+            return None
+
+    def get_folded(self, profile_id: str) -> Optional[str]:
+        content = self._read(profile_id, "folded")
+        return None if content is None else content.decode("utf-8")
+
+    def get_payload(self, profile_id: str) -> Optional[bytes]:
+        """Exact request body as received"""
+        return self._read(profile_id, "body")
+
+    def _path(self, profile_id: str, ext: str) -> Optional[str]:
+        if not _PROFILE_ID_RE.match(profile_id):
+            return None
+        return os.path.join(self.directory, f"{profile_id}.{ext}")
+
+    def _read(self, profile_id: str, ext: str) -> Optional[bytes]:
+        path = self._path(profile_id, ext)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _entries(self) -> List[Tuple[str, int]]:
+        """(profile id, metadata mtime) for every stored entry, from directory metadata only"""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    try:
+                        entries.append((entry.name[:-len(".json")], entry.stat().st_mtime_ns))
+                    except FileNotFoundError:
+                        pass
+        return entries
+
+    def _write_atomic(self, name: str, content: bytes):
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        for profile_id, _ in entries[:max(0, len(entries) - self.capacity)]:
+            for ext in self._EXTENSIONS:
+                try:
+                    os.remove(os.path.join(self.directory, f"{profile_id}.{ext}"))
+                except FileNotFoundError:
+                    pass
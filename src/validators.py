@@ -2,8 +2,9 @@ from typing import List, Tuple
 from datetime import date
 
 # Fixed: Use absolute imports
-from src.models import Order
-from constants import ErrorMessages
+from src.models import Order, Truck
+from src.capacity import CapacityVector
+from src.constants import ErrorMessages
 
 
 def validate_orders_compatibility(orders: List[Order]) -> Tuple[bool, str]:
@@ -46,9 +47,11 @@ def validate_orders_compatibility(orders: List[Order]) -> Tuple[bool, str]:
 
 
 def validate_capacity(truck: Truck, orders: List[Order]) -> bool:
-    """Validate if orders fit in truck capacity"""
-    total_weight = sum(order.weight_lbs for order in orders)
-    total_volume = sum(order.volume_cuft for order in orders)
-    
-    return (total_weight <= truck.max_weight_lbs and 
-            total_volume <= truck.max_volume_cuft)
\ No newline at end of file
+    """Validate if orders fit in truck capacity along every dimension"""
+    capacity = CapacityVector(truck)
+    load = 0
+    for order in orders:
+        load += capacity.pack(order)
+        if not capacity.fits(load):
+            return False
+    return True
\ No newline at end of file
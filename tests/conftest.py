@@ -0,0 +1,12 @@
+import pytest
+from src.cache import SharedResultCache
+from src.optimizer import LoadOptimizer
+
+
+@pytest.fixture
+def shared_result_cache(tmp_path, monkeypatch):
+    """Point the app's optimizer at a fresh shared cache, never one left by another process"""
+    import src.main as main
+    cache = SharedResultCache(str(tmp_path / "results.sqlite3"), 100)
+    monkeypatch.setattr(main, "optimizer", LoadOptimizer(cache=cache))
+    return cache
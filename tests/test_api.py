@@ -136,4 +136,18 @@ def test_hazmat_conflict():
     assert response.status_code == 200
     # Should select only one order (not both since hazmat conflicts)
     result = response.json()
-    assert len(result["selected_order_ids"]) == 1
\ No newline at end of file
+    assert len(result["selected_order_ids"]) == 1
+
+def test_truck_capacity_reserved_name():
+    request_data = {
+        "truck": {
+            "id": "truck-123",
+            "max_weight_lbs": 44000,
+            "max_volume_cuft": 3000,
+            "capacities": {"weight_lbs": 10}
+        },
+        "orders": []
+    }
+    
+    response = client.post("/api/v1/load-optimizer/optimize", json=request_data)
+    assert response.status_code == 400
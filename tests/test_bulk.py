@@ -0,0 +1,137 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from src import cli
+from src.constants import MAX_NDJSON_LINE_BYTES
+
+client = TestClient(app)
+
+# Bulk solves run through the app optimizer with the shared cache enabled
+pytestmark = pytest.mark.usefixtures("shared_result_cache")
+
+def make_request(truck_id, n_orders=2):
+    return {
+        "truck": {
+            "id": truck_id,
+            "max_weight_lbs": 44000,
+            "max_volume_cuft": 3000
+        },
+        "orders": [
+            {
+                "id": f"ord-{i:03d}",
+                "payout_cents": 100000 + i,
+                "weight_lbs": 10000,
+                "volume_cuft": 700,
+                "origin": "Los Angeles, CA",
+                "destination": "Dallas, TX",
+                "pickup_date": "2025-12-05",
+                "delivery_date": "2025-12-09",
+                "is_hazmat": False
+            }
+            for i in range(n_orders)
+        ]
+    }
+
+def ndjson(lines):
+    return "".join(line + "\n" for line in lines).encode()
+
+def parse_records(text):
+    return {record["line"]: record for record in map(json.loads, text.splitlines())}
+
+def test_bulk_streams_result_per_line():
+    body = ndjson([
+        json.dumps(make_request("truck-1")),
+        "",
+        json.dumps(make_request("truck-2", 3)),
+        '{"truck": {"id": "bad"}}',
+        json.dumps(make_request("truck-3", 30)),
+    ])
+
+    def chunks():
+        # Split mid-line to exercise incremental parsing
+        for i in range(0, len(body), 37):
+            yield body[i:i + 37]
+
+    response = client.post("/api/v1/load-optimizer/optimize/bulk", content=chunks())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    records = parse_records(response.text)
+    assert set(records) == {1, 3, 4, 5}
+    assert records[1]["result"]["truck_id"] == "truck-1"
+    assert records[1]["result"]["selected_order_ids"] == ["ord-000", "ord-001"]
+    assert records[3]["result"]["truck_id"] == "truck-2"
+    assert records[4]["error"]["error"] == "VALIDATION_ERROR"
+    assert records[5]["error"]["error"] == "PAYLOAD_TOO_LARGE"
+
+def test_bulk_rejects_oversized_line():
+    body = ndjson([
+        json.dumps({"padding": "x" * (MAX_NDJSON_LINE_BYTES + 10)}),
+        json.dumps(make_request("truck-1")),
+    ])
+
+    response = client.post("/api/v1/load-optimizer/optimize/bulk", content=body)
+    records = parse_records(response.text)
+    assert records[1]["error"]["error"] == "PAYLOAD_TOO_LARGE"
+    assert records[2]["result"]["truck_id"] == "truck-1"
+
+def test_bulk_empty_body():
+    response = client.post("/api/v1/load-optimizer/optimize/bulk", content=b"")
+    assert response.status_code == 200
+    assert response.text == ""
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cli_writes_results(tmp_path, workers):
+    input_path = tmp_path / "requests.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    input_path.write_bytes(ndjson([json.dumps(make_request(f"truck-{i}")) for i in range(10)]))
+
+    exit_code = cli.main([str(input_path), "-o", str(output_path), "--workers", str(workers)])
+
+    assert exit_code == 0
+    records = parse_records(output_path.read_text())
+    assert set(records) == set(range(1, 11))
+    assert all(records[i]["result"]["truck_id"] == f"truck-{i - 1}" for i in records)
+
+def test_cli_reports_errors(tmp_path):
+    input_path = tmp_path / "requests.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    input_path.write_bytes(ndjson(["not json"]))
+
+    assert cli.main([str(input_path), "-o", str(output_path), "--workers", "1"]) == 1
+    assert parse_records(output_path.read_text())[1]["error"]["error"] == "VALIDATION_ERROR"
+
+def test_iter_ndjson_lines_flags_oversized_line_within_chunk():
+    from src.bulk import iter_ndjson_lines
+    big = b"x" * (MAX_NDJSON_LINE_BYTES + 1)
+    lines = list(iter_ndjson_lines([b"{}\n" + big + b"\n{}\n"]))
+    assert lines == [(1, b"{}"), (2, None), (3, b"{}")]
+
+def test_stream_results_yields_before_input_ends():
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    from src.bulk import stream_results
+
+    async def scenario():
+        more_input = asyncio.Event()
+
+        async def lines():
+            yield 1, b"first"
+            # Client keeps the stream open without sending more lines
+            await more_input.wait()
+            yield 2, b"second"
+
+        def solve(lineno, line):
+            return {"line": lineno, "result": line.decode()}
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            stream = stream_results(lines(), solve, executor, max_in_flight=8)
+            first = await asyncio.wait_for(stream.__anext__(), timeout=5)
+            more_input.set()
+            rest = [record async for record in stream]
+        return first, rest
+
+    first, rest = asyncio.run(scenario())
+    assert json.loads(first) == {"line": 1, "result": "first"}
+    assert [json.loads(record) for record in rest] == [{"line": 2, "result": "second"}]
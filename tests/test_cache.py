@@ -0,0 +1,105 @@
+import pytest
+from datetime import date
+from src.models import Order, Truck
+from src.cache import SharedResultCache, canonical_request_key
+from src.optimizer import LoadOptimizer
+
+def create_orders():
+    return [
+        Order(
+            id=f"ord-{i:03d}",
+            payout_cents=100000 * (i + 1),
+            weight_lbs=10000,
+            volume_cuft=700,
+            origin="Los Angeles, CA",
+            destination="Dallas, TX",
+            pickup_date=date(2025, 12, 5),
+            delivery_date=date(2025, 12, 9),
+            is_hazmat=False
+        )
+        for i in range(5)
+    ]
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "results.sqlite3")
+
+def test_canonical_key_ignores_truck_id_only():
+    orders = create_orders()
+    truck_a = Truck(id="truck-a", max_weight_lbs=44000, max_volume_cuft=3000)
+    truck_b = Truck(id="truck-b", max_weight_lbs=44000, max_volume_cuft=3000)
+    truck_c = Truck(id="truck-a", max_weight_lbs=40000, max_volume_cuft=3000)
+
+    key = canonical_request_key(truck_a, orders)
+    assert key == canonical_request_key(truck_b, orders)
+    assert key != canonical_request_key(truck_a, list(reversed(orders)))
+    assert key != canonical_request_key(truck_c, orders)
+    assert key != canonical_request_key(truck_a, orders[:-1])
+
+def test_result_shared_between_workers(cache_path):
+    # Two optimizers with their own connections stand in for two worker processes
+    worker_a = LoadOptimizer(cache=SharedResultCache(cache_path, 100))
+    worker_b = LoadOptimizer(cache=SharedResultCache(cache_path, 100))
+    orders = create_orders()
+
+    first = worker_a.optimize(Truck(id="truck-a", max_weight_lbs=44000, max_volume_cuft=3000), orders)
+    second = worker_b.optimize(Truck(id="truck-b", max_weight_lbs=44000, max_volume_cuft=3000), orders)
+
+    assert worker_a.cache_misses == 1
+    assert worker_b.cache_hits == 1
+    assert second.truck_id == "truck-b"
+    assert second.selected_order_ids == first.selected_order_ids
+    assert second.total_payout_cents == first.total_payout_cents
+
+def test_cache_is_bounded(cache_path):
+    cache = SharedResultCache(cache_path, 3)
+    optimizer = LoadOptimizer(cache=cache)
+    orders = create_orders()
+    truck = Truck(id="truck-a", max_weight_lbs=44000, max_volume_cuft=3000)
+
+    keys = []
+    for n in range(1, 6):
+        optimizer.optimize(truck, orders[:n])
+        keys.append(canonical_request_key(truck, orders[:n]))
+
+    assert [cache.get(key) is not None for key in keys] == [False, False, True, True, True]
+
+def test_optimizer_without_cache():
+    optimizer = LoadOptimizer()
+    truck = Truck(id="truck-a", max_weight_lbs=44000, max_volume_cuft=3000)
+    result = optimizer.optimize(truck, create_orders())
+
+    assert result.total_payout_cents == 1400000
+    assert optimizer.cache_hits == 0 and optimizer.cache_misses == 0
+
+def test_cache_holds_max_entries_after_replacements(cache_path):
+    cache = SharedResultCache(cache_path, 3)
+    optimizer = LoadOptimizer(cache=cache)
+    truck = Truck(id="truck-a", max_weight_lbs=44000, max_volume_cuft=3000)
+    orders = create_orders()
+    result = optimizer.optimize(truck, orders)
+
+    # Re-putting existing keys leaves rowid gaps; the bound must still be exact
+    for n in range(1, 6):
+        for _ in range(3):
+            cache.put(canonical_request_key(truck, orders[:n]), result)
+
+    count = cache._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    assert count == 3
+
+def test_api_repeat_served_from_shared_cache(shared_result_cache):
+    from fastapi.testclient import TestClient
+    import src.main as main
+    client = TestClient(main.app)
+    request_data = {
+        "truck": {"id": "truck-a", "max_weight_lbs": 44000, "max_volume_cuft": 3000},
+        "orders": [order.model_dump(mode="json") for order in create_orders()]
+    }
+
+    first = client.post("/api/v1/load-optimizer/optimize", json=request_data)
+    request_data["truck"]["id"] = "truck-b"
+    second = client.post("/api/v1/load-optimizer/optimize", json=request_data)
+
+    assert (main.optimizer.cache_misses, main.optimizer.cache_hits) == (1, 1)
+    assert second.json()["truck_id"] == "truck-b"
+    assert second.json()["selected_order_ids"] == first.json()["selected_order_ids"]
@@ -0,0 +1,130 @@
+import json
+import struct
+import pytest
+from datetime import date
+from fastapi.testclient import TestClient
+from src.main import app
+from src.models import Order, Truck, OptimizationRequest, ChainPlanRequest
+from src.columnar import ColumnarFormatError, decode_request, encode_request
+from src.constants import COLUMNAR_CONTENT_TYPE
+
+client = TestClient(app)
+
+COLUMNAR = {"Content-Type": COLUMNAR_CONTENT_TYPE}
+
+def create_request(**truck_extra):
+    orders = [
+        Order(
+            id="ord-001",
+            payout_cents=250000,
+            weight_lbs=18000,
+            volume_cuft=1200,
+            origin="Los Angeles, CA",
+            destination="Dallas, TX",
+            pickup_date=date(2025, 12, 5),
+            delivery_date=date(2025, 12, 9),
+            is_hazmat=False,
+            dimensions={"pallet_positions": 10}
+        ),
+        Order(
+            id="ord-002",
+            payout_cents=180000,
+            weight_lbs=12000,
+            volume_cuft=900,
+            origin="Los Angeles, CA",
+            destination="Dallas, TX",
+            pickup_date=date(2025, 12, 4),
+            delivery_date=date(2025, 12, 10),
+            is_hazmat=False
+        ),
+        Order(
+            id="ord-003",
+            payout_cents=320000,
+            weight_lbs=30000,
+            volume_cuft=1800,
+            origin="Chicago, IL",
+            destination="Dallas, TX",
+            pickup_date=date(2025, 12, 6),
+            delivery_date=date(2025, 12, 8),
+            is_hazmat=True
+        )
+    ]
+    truck = Truck(id="truck-123", max_weight_lbs=44000, max_volume_cuft=3000, **truck_extra)
+    return OptimizationRequest(truck=truck, orders=orders)
+
+def test_roundtrip_matches_json_models():
+    request = create_request(capacities={"pallet_positions": 26})
+    decoded = decode_request(encode_request(request), OptimizationRequest)
+
+    expected = request.model_dump()
+    expected["orders"][1]["dimensions"] = {"pallet_positions": 0}
+    expected["orders"][2]["dimensions"] = {"pallet_positions": 0}
+    assert decoded.model_dump() == expected
+
+def test_optimize_columnar_matches_json():
+    request = create_request()
+
+    json_response = client.post("/api/v1/load-optimizer/optimize", content=request.model_dump_json(),
+                                headers={"Content-Type": "application/json"})
+    columnar_response = client.post("/api/v1/load-optimizer/optimize",
+                                    content=encode_request(request), headers=COLUMNAR)
+
+    assert columnar_response.status_code == 200
+    assert columnar_response.json() == json_response.json()
+    assert columnar_response.json()["selected_order_ids"] == ["ord-001", "ord-002"]
+
+def test_plan_columnar():
+    request = ChainPlanRequest(
+        truck=create_request().truck,
+        orders=create_request().orders[:1],
+        start_location="Los Angeles, CA",
+        start_date=date(2025, 12, 1)
+    )
+
+    response = client.post("/api/v1/load-optimizer/plan", content=encode_request(request), headers=COLUMNAR)
+    assert response.status_code == 200
+    assert response.json()["total_payout_cents"] == 250000
+
+def corrupt_column(body, column_offset_from_end, value, fmt):
+    body = bytearray(body)
+    struct.pack_into(fmt, body, len(body) - column_offset_from_end, value)
+    return bytes(body)
+
+@pytest.mark.parametrize("mutate", [
+    lambda body: b"JSON" + body[4:],                     # bad magic
+    lambda body: body[:-1],                              # truncated columns
+    lambda body: body + b"\x00",                         # trailing bytes
+    lambda body: corrupt_column(body, 3, 2, "<B"),       # hazmat not 0/1
+    # Layout ends with: lane i32[3], pallet_positions i32[3], is_hazmat u8[3]
+    lambda body: corrupt_column(body, 3 + 12 + 12, 7, "<i"),  # lane out of range
+    lambda body: corrupt_column(body, 3 + 12, -1, "<i"),      # negative dimension
+])
+def test_invalid_columns_rejected(mutate):
+    body = mutate(encode_request(create_request()))
+
+    with pytest.raises(ColumnarFormatError):
+        decode_request(body, OptimizationRequest)
+
+    response = client.post("/api/v1/load-optimizer/optimize", content=body, headers=COLUMNAR)
+    assert response.status_code == 400
+    assert response.json()["error"] == "VALIDATION_ERROR"
+
+def test_invalid_header_fields_rejected():
+    request = create_request()
+    request.truck.max_weight_lbs = -1
+
+    response = client.post("/api/v1/load-optimizer/optimize",
+                           content=encode_request(request), headers=COLUMNAR)
+    assert response.status_code == 400
+
+def test_bulk_columnar_frames():
+    frames = [encode_request(create_request()), b"garbage", encode_request(create_request())]
+    body = b"".join(struct.pack("<I", len(frame)) + frame for frame in frames)
+
+    response = client.post("/api/v1/load-optimizer/optimize/bulk", content=body, headers=COLUMNAR)
+    assert response.status_code == 200
+
+    records = {record["line"]: record for record in map(json.loads, response.text.splitlines())}
+    assert records[1]["result"]["selected_order_ids"] == ["ord-001", "ord-002"]
+    assert records[2]["error"]["error"] == "VALIDATION_ERROR"
+    assert records[3]["result"]["total_payout_cents"] == 430000
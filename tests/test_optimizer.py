@@ -156,4 +156,69 @@ def test_optimizer_different_routes():
     assert len(result.selected_order_ids) == 1
     # Should select the higher paying order
     if len(result.selected_order_ids) == 1:
-        assert result.selected_order_ids[0] == "ord-002"
\ No newline at end of file
+        assert result.selected_order_ids[0] == "ord-002"
+
+def test_optimizer_extra_dimensions():
+    truck = Truck(
+        id="truck-123",
+        max_weight_lbs=44000,
+        max_volume_cuft=3000,
+        capacities={"pallet_positions": 26, "linear_feet": 53}
+    )
+    
+    orders = [
+        Order(
+            id=f"ord-{i:03d}",
+            payout_cents=payout,
+            weight_lbs=5000,
+            volume_cuft=300,
+            origin="Los Angeles, CA",
+            destination="Dallas, TX",
+            pickup_date=date(2025, 12, 5),
+            delivery_date=date(2025, 12, 9),
+            is_hazmat=False,
+            dimensions={"pallet_positions": pallets, "linear_feet": feet}
+        )
+        for i, (payout, pallets, feet) in enumerate([
+            (300000, 14, 20),
+            (250000, 12, 20),
+            (200000, 10, 30),  # Would fit pallets with ord-000, but not linear feet
+        ])
+    ]
+    
+    optimizer = LoadOptimizer()
+    result = optimizer.optimize_bruteforce(truck, orders)
+    
+    assert result.selected_order_ids == ["ord-000", "ord-001"]
+    assert result.dimension_totals == {"pallet_positions": 26, "linear_feet": 40}
+    assert result.dimension_utilization_percent["pallet_positions"] == 100.0
+
+def test_optimizer_order_exceeding_extra_dimension():
+    truck = Truck(
+        id="truck-123",
+        max_weight_lbs=44000,
+        max_volume_cuft=3000,
+        capacities={"axle_weight_lbs": 12000}
+    )
+    
+    orders = create_sample_orders()[:2]
+    orders[0] = orders[0].model_copy(update={"dimensions": {"axle_weight_lbs": 1 << 40}})
+    
+    optimizer = LoadOptimizer()
+    result = optimizer.optimize_bruteforce(truck, orders)
+    
+    assert result.selected_order_ids == ["ord-002"]
+
+def test_optimizer_empty_reports_extra_dimensions():
+    truck = Truck(
+        id="truck-123",
+        max_weight_lbs=44000,
+        max_volume_cuft=3000,
+        capacities={"pallet_positions": 26}
+    )
+    
+    optimizer = LoadOptimizer()
+    result = optimizer.optimize_bruteforce(truck, [])
+    
+    assert result.dimension_totals == {"pallet_positions": 0}
+    assert result.dimension_utilization_percent == {"pallet_positions": 0.0}
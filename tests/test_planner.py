@@ -0,0 +1,149 @@
+import time
+import pytest
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from src.main import app
+from src.models import Order, Truck
+from src.optimizer import LoadOptimizer
+from src.planner import plan_load_chain
+
+client = TestClient(app)
+
+TRUCK = Truck(id="truck-123", max_weight_lbs=44000, max_volume_cuft=3000)
+
+def make_order(order_id, origin, destination, pickup, delivery, payout, weight=10000):
+    return Order(
+        id=order_id,
+        payout_cents=payout,
+        weight_lbs=weight,
+        volume_cuft=500,
+        origin=origin,
+        destination=destination,
+        pickup_date=pickup,
+        delivery_date=delivery,
+        is_hazmat=False
+    )
+
+def test_chain_beats_greedy_first_load():
+    orders = [
+        # Greedy pick: best first load, but nothing leaves Phoenix afterwards
+        make_order("ord-phx", "Los Angeles, CA", "Phoenix, AZ", date(2025, 12, 1), date(2025, 12, 2), 300000),
+        make_order("ord-dal-1", "Los Angeles, CA", "Dallas, TX", date(2025, 12, 1), date(2025, 12, 3), 150000),
+        make_order("ord-dal-2", "Los Angeles, CA", "Dallas, TX", date(2025, 12, 1), date(2025, 12, 4), 100000),
+        make_order("ord-chi", "Dallas, TX", "Chicago, IL", date(2025, 12, 5), date(2025, 12, 7), 200000),
+        # Leaves Dallas before the truck is free there
+        make_order("ord-early", "Dallas, TX", "Atlanta, GA", date(2025, 12, 4), date(2025, 12, 6), 500000),
+    ]
+
+    plan = plan_load_chain(LoadOptimizer(), TRUCK, orders, "Los Angeles, CA", date(2025, 12, 1))
+
+    assert [(p.origin, p.destination) for p in plan.loads] == [
+        ("Los Angeles, CA", "Dallas, TX"),
+        ("Dallas, TX", "Chicago, IL"),
+    ]
+    assert plan.loads[0].load.selected_order_ids == ["ord-dal-1", "ord-dal-2"]
+    assert plan.loads[0].delivery_date == date(2025, 12, 4)
+    assert plan.total_payout_cents == 450000
+
+def test_chain_waits_for_later_pickup():
+    orders = [
+        make_order("ord-001", "Los Angeles, CA", "Dallas, TX", date(2025, 12, 3), date(2025, 12, 5), 100000),
+        make_order("ord-002", "Chicago, IL", "Dallas, TX", date(2025, 12, 1), date(2025, 12, 2), 900000),
+    ]
+
+    plan = plan_load_chain(LoadOptimizer(), TRUCK, orders, "Los Angeles, CA", date(2025, 12, 1))
+
+    assert [p.load.selected_order_ids for p in plan.loads] == [["ord-001"]]
+    assert plan.total_payout_cents == 100000
+
+def test_chain_respects_date_bounds():
+    orders = [
+        make_order("ord-old", "Los Angeles, CA", "Dallas, TX", date(2025, 11, 28), date(2025, 11, 30), 100000),
+        make_order("ord-late", "Los Angeles, CA", "Dallas, TX", date(2025, 12, 2), date(2025, 12, 12), 100000),
+    ]
+
+    plan = plan_load_chain(
+        LoadOptimizer(), TRUCK, orders, "Los Angeles, CA", date(2025, 12, 1), date(2025, 12, 10)
+    )
+
+    assert plan.loads == []
+    assert plan.total_payout_cents == 0
+
+def test_week_long_plan_is_fast():
+    cities = ["Los Angeles, CA", "Dallas, TX", "Chicago, IL", "Atlanta, GA", "Denver, CO"]
+    start = date(2025, 12, 1)
+    orders = []
+    for day in range(7):
+        for a, origin in enumerate(cities):
+            for b, destination in enumerate(cities):
+                if a == b:
+                    continue
+                for k in range(4):
+                    orders.append(make_order(
+                        f"ord-{day}-{a}-{b}-{k}", origin, destination,
+                        start + timedelta(days=day), start + timedelta(days=day + 1 + (a + b) % 2),
+                        100000 + 1000 * ((day * 7 + a * 3 + b + k) % 11), weight=8000 + 1000 * k
+                    ))
+
+    started = time.perf_counter()
+    plan = plan_load_chain(LoadOptimizer(), TRUCK, orders, cities[0], start)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0
+    assert len(plan.loads) >= 3
+    for previous, following in zip(plan.loads, plan.loads[1:]):
+        assert following.origin == previous.destination
+        assert following.pickup_date > previous.delivery_date
+
+def test_chain_ignores_orders_delivered_before_pickup():
+    orders = [
+        make_order("ord-001", "Los Angeles, CA", "Dallas, TX", date(2025, 12, 5), date(2025, 12, 1), 100000),
+        make_order("ord-002", "Dallas, TX", "Los Angeles, CA", date(2025, 12, 3), date(2025, 12, 1), 100000),
+        make_order("ord-003", "Los Angeles, CA", "Dallas, TX", date(2025, 12, 6), date(2025, 12, 8), 50000),
+    ]
+
+    plan = plan_load_chain(LoadOptimizer(), TRUCK, orders, "Los Angeles, CA", date(2025, 12, 1))
+
+    assert [p.load.selected_order_ids for p in plan.loads] == [["ord-003"]]
+    assert plan.total_payout_cents == 50000
+
+def test_plan_endpoint():
+    request_data = {
+        "truck": {"id": "truck-123", "max_weight_lbs": 44000, "max_volume_cuft": 3000},
+        "start_location": "Los Angeles, CA",
+        "start_date": "2025-12-01",
+        "orders": [
+            make_order("ord-001", "Los Angeles, CA", "Dallas, TX", date(2025, 12, 1), date(2025, 12, 3), 150000).model_dump(mode="json"),
+            make_order("ord-002", "Dallas, TX", "Chicago, IL", date(2025, 12, 4), date(2025, 12, 6), 200000).model_dump(mode="json"),
+        ]
+    }
+
+    response = client.post("/api/v1/load-optimizer/plan", json=request_data)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["total_payout_cents"] == 350000
+    assert [load["load"]["selected_order_ids"] for load in result["loads"]] == [["ord-001"], ["ord-002"]]
+
+def test_plan_endpoint_rejects_oversized_lane_day():
+    orders = [
+        make_order(f"ord-{i}", "Los Angeles, CA", "Dallas, TX", date(2025, 12, 1), date(2025, 12, 3), 1000, weight=100).model_dump(mode="json")
+        for i in range(13)
+    ]
+    request_data = {
+        "truck": {"id": "truck-123", "max_weight_lbs": 44000, "max_volume_cuft": 3000},
+        "start_location": "Los Angeles, CA",
+        "start_date": "2025-12-01",
+        "orders": orders
+    }
+
+    response = client.post("/api/v1/load-optimizer/plan", json=request_data)
+    assert response.status_code == 413
+
+def test_plan_endpoint_rejects_oversized_payload():
+    response = client.post(
+        "/api/v1/load-optimizer/plan",
+        content=b" " * (1024 * 1024 + 1),
+        headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 413
+    assert response.json()["error"] == "PAYLOAD_TOO_LARGE"
@@ -0,0 +1,159 @@
+import os
+import pytest
+from fastapi.testclient import TestClient
+
+import src.main as main
+from src.main import app
+from src.profiling import FoldedProfiler, ProfileStore
+from src.columnar import encode_request
+from src.constants import COLUMNAR_CONTENT_TYPE
+from src.models import OptimizationRequest
+
+client = TestClient(app)
+
+REQUEST_DATA = {
+    "truck": {
+        "id": "truck-123",
+        "max_weight_lbs": 44000,
+        "max_volume_cuft": 3000
+    },
+    "orders": [
+        {
+            "id": f"ord-{i:03d}",
+            "payout_cents": 100000 + i,
+            "weight_lbs": 5000,
+            "volume_cuft": 300,
+            "origin": "Los Angeles, CA",
+            "destination": "Dallas, TX",
+            "pickup_date": "2025-12-05",
+            "delivery_date": "2025-12-09",
+            "is_hazmat": False
+        }
+        for i in range(8)
+    ]
+}
+
+
+@pytest.fixture
+def profiling_enabled(tmp_path, monkeypatch):
+    store = ProfileStore(str(tmp_path), capacity=2)
+    monkeypatch.setattr(main, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(main, "profile_store", store)
+    return store
+
+
+def test_profiling_disabled_by_default():
+    response = client.post(
+        "/api/v1/load-optimizer/optimize", json=REQUEST_DATA, headers={"X-Profile": "1"}
+    )
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert client.get("/debug/profiles").status_code == 404
+
+
+def test_profile_not_captured_without_header(profiling_enabled):
+    response = client.post("/api/v1/load-optimizer/optimize", json=REQUEST_DATA)
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert profiling_enabled.list_profiles() == []
+
+
+def test_profile_captured_and_retrievable(profiling_enabled):
+    response = client.post(
+        "/api/v1/load-optimizer/optimize?profile=1", json=REQUEST_DATA
+    )
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    folded = client.get(f"/debug/profiles/{profile_id}")
+    assert folded.status_code == 200
+    assert "src.optimizer:optimize_bruteforce" in folded.text
+    for line in folded.text.splitlines():
+        stack, weight = line.rsplit(" ", 1)
+        assert stack and int(weight) > 0
+
+    payload = client.get(f"/debug/profiles/{profile_id}/request")
+    assert payload.json() == REQUEST_DATA
+
+    listing = client.get("/debug/profiles").json()["profiles"]
+    assert [p["id"] for p in listing] == [profile_id]
+
+
+def test_columnar_profile_replays_exactly(profiling_enabled):
+    body = encode_request(OptimizationRequest.model_validate(REQUEST_DATA))
+    headers = {"Content-Type": COLUMNAR_CONTENT_TYPE, "X-Profile": "1"}
+    response = client.post("/api/v1/load-optimizer/optimize", content=body, headers=headers)
+    assert response.status_code == 200
+
+    payload = client.get(f"/debug/profiles/{response.headers['X-Profile-Id']}/request")
+    assert payload.content == body
+    assert payload.headers["content-type"] == COLUMNAR_CONTENT_TYPE
+
+    replay = client.post(
+        "/api/v1/load-optimizer/optimize",
+        content=payload.content,
+        headers={"Content-Type": payload.headers["content-type"]}
+    )
+    assert replay.status_code == 200
+    assert replay.json() == response.json()
+
+
+def test_profile_ring_is_bounded(profiling_enabled):
+    ids = []
+    for _ in range(3):
+        response = client.post(
+            "/api/v1/load-optimizer/optimize", json=REQUEST_DATA, headers={"X-Profile": "1"}
+        )
+        ids.append(response.headers["X-Profile-Id"])
+
+    stored = {p["id"] for p in profiling_enabled.list_profiles()}
+    assert stored == set(ids[1:])
+    assert client.get(f"/debug/profiles/{ids[0]}").status_code == 404
+    assert not any(name.startswith(ids[0]) for name in os.listdir(profiling_enabled.directory))
+
+
+def test_profile_metadata_excludes_payload(profiling_enabled):
+    response = client.post(
+        "/api/v1/load-optimizer/optimize", json=REQUEST_DATA, headers={"X-Profile": "1"}
+    )
+    meta = profiling_enabled.get_meta(response.headers["X-Profile-Id"])
+
+    assert "payload" not in meta
+    assert meta["payload_bytes"] == len(response.request.content)
+
+
+def test_profile_id_rejects_paths(profiling_enabled):
+    assert profiling_enabled.get_meta("../../etc/passwd") is None
+    assert client.get("/debug/profiles/not-a-profile").status_code == 404
+
+
+def test_folded_profiler_output():
+    def leaf():
+        return sum(range(20000))
+
+    with FoldedProfiler() as profiler:
+        leaf()
+
+    assert "test_profiling:leaf" in profiler.folded()
+
+
+def test_profile_store_failure_does_not_fail_solve(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.setattr(main, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(main, "profile_store", ProfileStore(str(blocker), capacity=2))
+
+    response = client.post(
+        "/api/v1/load-optimizer/optimize", json=REQUEST_DATA, headers={"X-Profile": "1"}
+    )
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert len(response.json()["selected_order_ids"]) == 8
+
+
+def test_debug_endpoints_require_token(profiling_enabled, monkeypatch):
+    monkeypatch.setattr(main, "PROFILE_DEBUG_TOKEN", "s3cret")
+
+    assert client.get("/debug/profiles").status_code == 403
+    assert client.get("/debug/profiles", headers={"X-Debug-Token": "wrong"}).status_code == 403
+    assert client.get("/debug/profiles", headers={"X-Debug-Token": "s3cret"}).status_code == 200
@@ -0,0 +1,37 @@
+from datetime import date
+from src.models import Order, Truck
+from src.validators import validate_capacity, validate_orders_compatibility
+
+def make_order(order_id, weight, pallets):
+    return Order(
+        id=order_id,
+        payout_cents=100000,
+        weight_lbs=weight,
+        volume_cuft=500,
+        origin="Los Angeles, CA",
+        destination="Dallas, TX",
+        pickup_date=date(2025, 12, 5),
+        delivery_date=date(2025, 12, 9),
+        is_hazmat=False,
+        dimensions={"pallet_positions": pallets}
+    )
+
+def test_validate_capacity_extra_dimensions():
+    truck = Truck(
+        id="truck-123",
+        max_weight_lbs=44000,
+        max_volume_cuft=3000,
+        capacities={"pallet_positions": 26}
+    )
+    
+    assert validate_capacity(truck, [make_order("ord-001", 10000, 14), make_order("ord-002", 10000, 12)])
+    assert not validate_capacity(truck, [make_order("ord-001", 10000, 14), make_order("ord-002", 10000, 13)])
+    assert not validate_capacity(truck, [make_order("ord-001", 30000, 1), make_order("ord-002", 20000, 1)])
+
+def test_validate_orders_compatibility_hazmat_conflict():
+    orders = [make_order("ord-001", 10000, 1), make_order("ord-002", 10000, 1)]
+    orders[1] = orders[1].model_copy(update={"is_hazmat": True})
+    
+    valid, message = validate_orders_compatibility(orders)
+    assert not valid
+    assert message